@@ -1,63 +1,78 @@
-from typing import TypedDict, List, Dict, Optional, Any
-from langchain_core.messages import BaseMessage
+from typing import TypedDict, Annotated, List, Dict, Optional, Any
+import operator
+from dataclasses import dataclass, field
 
-class JobCoachState(TypedDict):
-    """State schema for the AI Job Application Coach multi-agent system."""
+
+def merge_dicts(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Reducer that merges dict updates from parallel nodes instead of overwriting."""
+    if not right:
+        return left
+    if not left:
+        return right
+    return {**left, **right}
+
+
+@dataclass(slots=True)
+class JobCoachState:
+    """State schema for the AI Job Application Coach multi-agent system.
+    
+    A slotted dataclass so nodes read fields by attribute instead of dict lookup.
+    """
     
     # Input and session management
-    user_query: str
-    user_id: int
-    session_id: str
+    user_query: str = ""
+    user_id: int = 1
+    session_id: str = "unknown"
     
     # Router outputs
-    intent: str
-    confidence: float
+    intent: str = ""
+    confidence: float = 0.0
     
     # Resume Agent data
-    resume_text: Optional[str]
-    job_description: Optional[str]
-    resume_analysis: Optional[Dict[str, Any]]
-    resume_suggestions: Optional[List[str]]
+    resume_text: Optional[str] = None
+    job_description: Optional[str] = None
+    resume_analysis: Optional[Dict[str, Any]] = None
+    resume_suggestions: Optional[List[str]] = None
     
     # Interview Agent data
-    interview_role: Optional[str]
-    interview_level: Optional[str]
-    interview_questions: List[Dict[str, Any]]
-    interview_answers: List[Dict[str, Any]]
-    interview_feedback: Optional[Dict[str, Any]]
-    interview_session_id: Optional[str]
+    interview_role: Optional[str] = None
+    interview_level: Optional[str] = None
+    interview_questions: List[Dict[str, Any]] = field(default_factory=list)
+    interview_answers: List[Dict[str, Any]] = field(default_factory=list)
+    interview_feedback: Optional[Dict[str, Any]] = None
+    interview_session_id: Optional[str] = None
     
     # Job Search Agent data
-    job_search_query: Optional[str]
-    job_search_location: Optional[str]
-    job_search_level: Optional[str]
-    job_results: List[Dict[str, Any]]
+    job_search_query: Optional[str] = None
+    job_search_location: Optional[str] = None
+    job_search_level: Optional[str] = None
+    job_results: List[Dict[str, Any]] = field(default_factory=list)
     
     # Knowledge Agent (RAG) data
-    knowledge_query: Optional[str]
-    knowledge_context: Optional[str]
-    knowledge_sources: List[str]
-    knowledge_answer: Optional[str]
+    knowledge_query: Optional[str] = None
+    knowledge_context: Optional[str] = None
+    knowledge_sources: List[str] = field(default_factory=list)
+    knowledge_answer: Optional[str] = None
     
     # Memory Agent data
-    user_profile: Optional[Dict[str, Any]]
-    conversation_history: List[Dict[str, Any]]
-    profile_updates: Optional[Dict[str, Any]]
+    user_profile: Optional[Dict[str, Any]] = None
+    conversation_history: List[Dict[str, Any]] = field(default_factory=list)
+    profile_updates: Optional[Dict[str, Any]] = None
     
     # Cross-agent communication
-    agent_messages: List[Dict[str, Any]]
-    shared_context: Optional[Dict[str, Any]]
+    agent_messages: List[Dict[str, Any]] = field(default_factory=list)
+    shared_context: Optional[Dict[str, Any]] = None
     
     # Output and response
-    response: str
-    next_action: Optional[str]
-    session_complete: bool
+    response: str = ""
+    next_action: Optional[str] = None
+    session_complete: bool = False
     
     # Metadata and tracking
-    processing_time: float
-    agents_used: List[str]
-    error_message: Optional[str]
-    debug_info: Optional[Dict[str, Any]]
+    processing_time: float = 0.0
+    agents_used: Annotated[List[str], operator.add] = field(default_factory=list)  # nodes return only their own name
+    error_message: Optional[str] = None
+    debug_info: Annotated[Optional[Dict[str, Any]], merge_dicts] = None
 
 
 class AgentMessage(TypedDict):
@@ -1,10 +1,440 @@
-from typing import Dict, Any
-from langgraph.graph import StateGraph, END
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+import asyncio
+import functools
+from functools import lru_cache
+from types import MappingProxyType
+import os
+import re
+import string
+import sys
 import time
 
 from app.graph.state import JobCoachState, INTENT_TYPES
+from app.tools.cache import redis_memoize
+from app.tools.scoring import match_score
 
 
+# Per-node timings and debug_info are only collected when JOBCOACH_DEBUG=1
+DEBUG = os.getenv("JOBCOACH_DEBUG") == "1"
+
+
+def _elapsed(start_ns: int) -> float:
+    """Seconds elapsed since a time.perf_counter_ns() reading."""
+    return (time.perf_counter_ns() - start_ns) / 1e9
+
+
+# API keys and credential assignments that must not leak into user-facing errors
+_SECRET_RE = re.compile(r"sk-[A-Za-z0-9_\-]{16,}|(?i:(?:api[_-]?key|token|secret|password)\s*[=:]\s*\S+)")
+
+
+def _describe_error(error: Exception) -> str:
+    """Exception type and message with anything resembling a credential redacted."""
+    return f"{type(error).__name__}: {_SECRET_RE.sub('[REDACTED]', str(error))}"
+
+
+def agent_node(name: str, error_label: str, on_error: Optional[Callable[[Exception], Dict[str, Any]]] = None):
+    """Wrap a workflow node with timing, agents_used bookkeeping and error handling.
+    
+    Exceptions become a redacted error_message prefixed with error_label; on_error may add
+    node-specific fallback fields. Timings are recorded under debug_info["<name>_time"].
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, state: JobCoachState) -> Dict[str, Any]:
+            start_time = time.perf_counter_ns() if DEBUG else 0
+            try:
+                result = fn(self, state)
+            except Exception as e:
+                result = {"error_message": f"{error_label}: {_describe_error(e)}"}
+                if on_error is not None:
+                    result.update(on_error(e))
+            
+            result["agents_used"] = [name]
+            if DEBUG:
+                result["debug_info"] = {**(result.get("debug_info") or {}), f"{name}_time": _elapsed(start_time)}
+            return result
+        return wrapper
+    return decorator
+
+
+def _normalize_query(text: Optional[str]) -> str:
+    """Lowercase and collapse whitespace; str.split() beats a regex substitution here."""
+    return " ".join((text or "").lower().split())
+
+
+def _bullets(items) -> str:
+    """Render items as a "• "-prefixed Markdown bullet list."""
+    return "• " + "\n• ".join(items) if items else ""
+
+
+def _keywords(*words: str) -> frozenset:
+    """Frozen keyword set with interned members.
+    
+    Only these fixed literals are interned: query tokens are not, since interned
+    strings are immortal on Python 3.12 and user input would grow memory for good.
+    """
+    return frozenset(map(sys.intern, words))
+
+
+# Keyword sets per intent, checked in order; first intersecting set wins.
+# Matching is on whole words, so inflected forms are listed explicitly rather
+# than substring-matched ("resumed" must not mean "resume", nor "show" "how").
+_INTENT_KEYWORDS = [
+    (
+        "resume_analysis",
+        _keywords(
+            "resume", "resumes", "cv", "cvs",
+            "review", "reviews", "reviewed", "reviewing",
+            "analyze", "analyzes", "analyzed", "analyzing"
+        ),
+        0.9
+    ),
+    (
+        "interview_practice",
+        _keywords(
+            "interview", "interviews", "interviewing",
+            "practice", "practicing", "questions", "mock"
+        ),
+        0.9
+    ),
+    (
+        "job_search",
+        _keywords(
+            "job", "jobs", "search", "searches", "searching",
+            "find", "finding", "opportunities"
+        ),
+        0.9
+    ),
+    ("career_advice", _keywords("advice", "help", "how", "tips", "guide", "guides"), 0.8),
+    (
+        "application_tracking",
+        _keywords(
+            "application", "applications", "track", "tracking", "tracked",
+            "status", "applied"
+        ),
+        0.9
+    ),
+]
+
+
+@lru_cache(maxsize=4096)
+def _classify(normalized_query: str) -> Tuple[str, float]:
+    """Classify a normalized (lowercased, whitespace-collapsed) query into (intent, confidence)."""
+    # Tokenize once and match whole words against the keyword sets
+    tokens = {word.strip(string.punctuation) for word in normalized_query.split()}
+    for intent, keywords, confidence in _INTENT_KEYWORDS:
+        if tokens & keywords:
+            return intent, confidence
+    return "unknown", 0.5
+
+
+# Agents that read the user profile; memory_load runs before them
+_PROFILE_AGENTS = frozenset({"resume", "interview"})
+
+# Graph node handling each intent; anything else goes straight to summary
+_INTENT_TO_NODE = {
+    "resume_analysis": "resume",
+    "resume_improvement": "resume",
+    "interview_practice": "interview",
+    "interview_start": "interview",
+    "interview_answer": "interview",
+    "job_search": "job_search",
+    "career_advice": "knowledge"
+}
+
+
+# Static mock payloads shared across requests, frozen so nothing can alter them
+# in place; nodes return shallow copies, which is all callers can reach since
+# nested sequences are tuples
+_MOCK_PROFILE = MappingProxyType({
+    "name": "Test User",
+    "skills": ("Python", "FastAPI", "Machine Learning"),
+    "experience_years": 5,
+    "target_roles": ("Software Engineer", "ML Engineer"),
+    "preferred_locations": ("Remote", "San Francisco"),
+    "weak_areas": ("System design", "Salary negotiation")
+})
+
+_MOCK_HISTORY = (
+    MappingProxyType({
+        "message": "Previous resume review",
+        "agent_used": "resume",
+        "created_at": "2024-02-05T10:00:00"
+    }),
+)
+
+_MOCK_ANALYSIS = MappingProxyType({
+    "overall_score": 7.5,
+    "strengths": (
+        "Clear work experience progression",
+        "Relevant technical skills listed",
+        "Good use of action verbs"
+    ),
+    "weaknesses": (
+        "Missing quantified achievements",
+        "Could improve professional summary",
+        "Some outdated technologies mentioned"
+    ),
+    "recommendations": (
+        "Add specific metrics to accomplishments (e.g., 'Improved performance by 25%')",
+        "Update skills section with current technologies",
+        "Tailor experience bullets to target role"
+    ),
+    "ats_compatibility": 8.0,
+    "keyword_analysis": None
+})
+
+_MOCK_ANALYSIS_WITH_KEYWORDS = MappingProxyType({
+    **_MOCK_ANALYSIS,
+    "keyword_analysis": ("API development", "database optimization")
+})
+
+# Question text is a str.format template filled with the interview role
+_MOCK_QUESTIONS = (
+    MappingProxyType({
+        "id": "q1",
+        "question": "Tell me about your experience relevant to {role}.",
+        "type": "behavioral",
+        "difficulty": "easy",
+        "key_points": ("Relevant experience", "Role understanding", "Communication skills")
+    }),
+    MappingProxyType({
+        "id": "q2",
+        "question": "Describe a challenging project and how you overcame obstacles.",
+        "type": "behavioral",
+        "difficulty": "medium",
+        "key_points": ("Problem solving", "Persistence", "Technical skills", "Results")
+    })
+)
+
+# Title, location and description are str.format templates filled with the search query/location
+_MOCK_JOBS_TEMPLATE = (
+    MappingProxyType({
+        "title": "Senior {query}",
+        "company": "TechCorp",
+        "location": "{location}",
+        "description": "Seeking experienced {query} professional...",
+        "url": "https://example.com/job/1",
+        "salary_range": "$100K-$150K",
+        "remote_friendly": True,
+        "match_score": 0.85,
+        "source": "mock_api"
+    }),
+    MappingProxyType({
+        "title": "Lead {query}",
+        "company": "InnovateInc",
+        "location": "San Francisco, CA",
+        "description": "Lead our {query} team...",
+        "url": "https://example.com/job/2",
+        "salary_range": "$120K-$180K",
+        "remote_friendly": False,
+        "match_score": 0.78,
+        "source": "mock_api"
+    })
+)
+
+_MOCK_ANSWER = """
+            Based on career best practices, here are key recommendations:
+            
+            1. **Build Your Network**: Attend industry events, join professional groups, and maintain active LinkedIn presence.
+            
+            2. **Continuous Learning**: Stay current with industry trends and invest in skill development.
+            
+            3. **Personal Branding**: Clearly articulate your unique value proposition and maintain consistent professional image.
+            
+            4. **Interview Preparation**: Practice common questions, prepare STAR method examples, and research company thoroughly.
+            
+            5. **Salary Negotiation**: Research market rates, document your achievements, and negotiate total compensation package.
+            """
+
+_MOCK_SOURCES = (
+    "Career Development Best Practices Guide",
+    "Professional Networking Handbook",
+    "Interview Success Manual"
+)
+
+
+# Default value for every state field; process_query copies it per request.
+# Empty tuples mark list fields, which get fresh per-call lists (see _LIST_FIELDS).
+_INITIAL_STATE_TEMPLATE: Dict[str, Any] = {
+    "user_query": "",
+    "user_id": 1,
+    "session_id": "",
+    "intent": "",
+    "confidence": 0.0,
+    "resume_text": None,
+    "job_description": None,
+    "resume_analysis": None,
+    "resume_suggestions": None,
+    "interview_role": None,
+    "interview_level": None,
+    "interview_questions": (),
+    "interview_answers": (),
+    "interview_feedback": None,
+    "interview_session_id": None,
+    "job_search_query": None,
+    "job_search_location": None,
+    "job_search_level": None,
+    "job_results": (),
+    "knowledge_query": None,
+    "knowledge_context": None,
+    "knowledge_sources": (),
+    "knowledge_answer": None,
+    "user_profile": None,
+    "conversation_history": (),
+    "profile_updates": None,
+    "agent_messages": (),
+    "shared_context": None,
+    "response": "",
+    "next_action": None,
+    "session_complete": False,
+    "processing_time": 0.0,
+    "agents_used": (),
+    "error_message": None,
+    "debug_info": None
+}
+
+# List-typed state fields; each request gets its own empty lists so results
+# never expose tuples or objects shared between requests
+_LIST_FIELDS = tuple(key for key, value in _INITIAL_STATE_TEMPLATE.items() if value == ())
+
+# Optional process_query keyword arguments copied into the initial state
+_INPUT_KWARGS = frozenset({
+    "resume_text",
+    "job_description",
+    "interview_role",
+    "interview_level",
+    "interview_session_id",
+    "job_search_query",
+    "job_search_location",
+    "job_search_level",
+    "knowledge_query"
+})
+
+
+# Summary response templates, parsed and stripped once at import
+_RESUME_TEMPLATE = string.Template("""
+## Resume Analysis Results
+
+**Overall Score: ${score}/10**
+
+### Strengths:
+${strengths}
+
+### Key Recommendations:
+${recommendations}
+
+Your resume shows good potential with some areas for improvement. Focus on quantifying your achievements and tailoring content to specific roles.
+""".strip())
+
+_INTERVIEW_TEMPLATE = string.Template("""
+## Interview Practice Session Started
+
+**Role**: ${role}
+**Level**: ${level}
+
+### First Question:
+${question}
+
+**Type**: ${type}
+**Key Points to Cover**: ${key_points}
+
+Take your time to provide a thoughtful answer. I'll give you detailed feedback and follow up with additional questions.
+""".strip())
+
+_JOB_SEARCH_TEMPLATE = string.Template("""
+## Job Search Results
+
+Found ${count} relevant opportunities:
+
+${job_list}
+
+These positions match your profile based on skills and experience. Would you like me to help you prepare application materials for any of these roles?
+""".strip())
+
+_CAREER_ADVICE_TEMPLATE = string.Template("""
+## Career Advice
+
+${answer}
+
+---
+*Sources: ${sources}*
+""".strip())
+
+
+
+def _render_resume(state: JobCoachState) -> str:
+    """Render the resume analysis response."""
+    analysis = state.resume_analysis
+    if not analysis:
+        return "I was unable to analyze your resume. Please ensure you've provided valid resume text."
+    
+    return _RESUME_TEMPLATE.substitute(
+        score=analysis.get("overall_score", 0),
+        strengths=_bullets(analysis.get("strengths", [])[:3]),
+        recommendations=_bullets(analysis.get("recommendations", [])[:3])
+    )
+
+
+def _render_interview(state: JobCoachState) -> str:
+    """Render the opening of an interview practice session."""
+    questions = state.interview_questions
+    if not questions:
+        return "I'm ready to start your interview practice session. What role would you like to practice for?"
+    
+    first_question = questions[0]
+    return _INTERVIEW_TEMPLATE.substitute(
+        role=state.interview_role,
+        level=state.interview_level,
+        question=first_question.get('question', 'Tell me about yourself.'),
+        type=first_question.get('type', 'behavioral'),
+        key_points=', '.join(first_question.get('key_points', []))
+    )
+
+
+def _render_job_search(state: JobCoachState) -> str:
+    """Render the top job search results."""
+    jobs = state.job_results
+    if not jobs:
+        return "I couldn't find any job opportunities matching your criteria. Try adjusting your search terms or location."
+    
+    return _JOB_SEARCH_TEMPLATE.substitute(
+        count=len(jobs),
+        job_list="\n\n".join(
+            f"{i}. **{job.get('title', 'Unknown Title')}** at {job.get('company', 'Unknown Company')}\n"
+            f"   Location: {job.get('location', 'Unknown')}\n"
+            f"   Salary: {job.get('salary_range', 'Not specified')}\n"
+            f"   Match Score: {job.get('match_score', 0):.0%}"
+            for i, job in enumerate(jobs[:3], 1)
+        )
+    )
+
+
+def _render_career_advice(state: JobCoachState) -> str:
+    """Render the knowledge agent's answer with its sources."""
+    answer = state.knowledge_answer
+    if not answer:
+        return "I'd be happy to help with career advice. Could you be more specific about what you'd like guidance on?"
+    
+    return _CAREER_ADVICE_TEMPLATE.substitute(
+        answer=answer,
+        sources=', '.join(state.knowledge_sources)
+    )
+
+
+def _render_default(state: JobCoachState) -> str:
+    """Generic reply for intents without a dedicated agent."""
+    return "I understand you're looking for career assistance. I can help with resume reviews, interview practice, job searches, and career advice. What would you like to work on?"
+
+
+# Response renderer for each intent; anything else gets the generic reply
+_RESPONSE_RENDERERS = {
+    "resume_analysis": _render_resume,
+    "interview_practice": _render_interview,
+    "job_search": _render_job_search,
+    "career_advice": _render_career_advice
+}
+
 class JobCoachWorkflow:
     """Main workflow orchestrator for the AI Job Application Coach."""
     
@@ -15,6 +445,8 @@ class JobCoachWorkflow:
     
     def _build_workflow(self):
         """Build the LangGraph state machine workflow."""
+        # Imported here so importing this module doesn't load langgraph
+        from langgraph.graph import StateGraph, END
         
         # Create the state graph
         workflow = StateGraph(JobCoachState)
@@ -29,22 +461,30 @@ class JobCoachWorkflow:
         workflow.add_node("memory_save", self._memory_save_agent)
         workflow.add_node("summary", self._summary_agent)
         
-        # Define entry point
-        workflow.set_entry_point("memory_load")
+        # Define entry point; the keyword router doesn't need the user profile
+        workflow.set_entry_point("router")
         
-        # Add edges from memory_load to router
-        workflow.add_edge("memory_load", "router")
-        
-        # Add conditional routing from router to specialized agents
+        # Route from router: agents that read the user profile go through
+        # memory_load first; the others skip loading it entirely
         workflow.add_conditional_edges(
             "router",
+            self._route_from_router,
+            {
+                "memory_load": "memory_load",
+                "summary": "summary",
+                "job_search": "job_search",
+                "knowledge": "knowledge"
+            }
+        )
+        
+        # memory_load hands over to the profile-dependent agent
+        workflow.add_conditional_edges(
+            "memory_load",
             self._route_to_agent,
             {
+                "summary": "summary",
                 "resume": "resume",
-                "interview": "interview", 
-                "job_search": "job_search",
-                "knowledge": "knowledge",
-                "summary": "summary"  # For unknown intents
+                "interview": "interview"
             }
         )
         
@@ -63,542 +503,296 @@ class JobCoachWorkflow:
         # Compile the workflow
         self.graph = workflow.compile()
     
+    @agent_node("router", "Router agent error", on_error=lambda e: {"intent": "unknown", "confidence": 0.0})
     def _router_agent(self, state: JobCoachState) -> Dict[str, Any]:
         """Router agent that classifies user intent and determines next agent."""
-        start_time = time.time()
+        # Simple intent classification (to be replaced with LLM)
+        normalized_query = _normalize_query(state.user_query)
+        intent, confidence = _classify(normalized_query)
         
-        try:
-            user_query = state.get("user_query", "").lower()
-            intent = "unknown"
-            confidence = 0.5
-            
-            # Simple intent classification (to be replaced with LLM)
-            if any(word in user_query for word in ["resume", "cv", "review", "analyze"]):
-                intent = "resume_analysis"
-                confidence = 0.9
-            elif any(word in user_query for word in ["interview", "practice", "questions", "mock"]):
-                intent = "interview_practice"  
-                confidence = 0.9
-            elif any(word in user_query for word in ["job", "search", "find", "opportunities"]):
-                intent = "job_search"
-                confidence = 0.9
-            elif any(word in user_query for word in ["advice", "help", "how", "tips", "guide"]):
-                intent = "career_advice"
-                confidence = 0.8
-            elif any(word in user_query for word in ["application", "track", "status", "applied"]):
-                intent = "application_tracking"
-                confidence = 0.9
-            
-            # Update state
-            agents_used = state.get("agents_used", [])
-            agents_used.append("router")
-            
-            return {
-                "intent": intent,
-                "confidence": confidence,
-                "agents_used": agents_used,
-                "debug_info": {
-                    "router_processing_time": time.time() - start_time,
-                    "classification_method": "keyword_based"
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "intent": "unknown",
-                "confidence": 0.0,
-                "error_message": f"Router agent error: {str(e)}",
-                "agents_used": state.get("agents_used", []) + ["router"]
-            }
+        return {
+            "intent": intent,
+            "confidence": confidence,
+            "debug_info": {"classification_method": "keyword_based"} if DEBUG else None
+        }
     
     def _route_to_agent(self, state: JobCoachState) -> str:
         """Determine which agent to route to based on intent."""
-        intent = state.get("intent", "unknown")
-        
-        if intent in ["resume_analysis", "resume_improvement"]:
-            return "resume"
-        elif intent in ["interview_practice", "interview_start", "interview_answer"]:
-            return "interview"
-        elif intent == "job_search":
-            return "job_search"
-        elif intent == "career_advice":
-            return "knowledge"
-        else:
-            return "summary"  # Handle unknown intents in summary
+        # Unknown intents are handled directly in summary
+        return _INTENT_TO_NODE.get(state.intent, "summary")
     
+    def _route_from_router(self, state: JobCoachState) -> str:
+        """Next node after the router: memory_load for agents that read the profile, else the agent."""
+        agent = self._route_to_agent(state)
+        return "memory_load" if agent in _PROFILE_AGENTS else agent
+    
+    @agent_node("memory_load", "Memory load error")
     def _memory_load_agent(self, state: JobCoachState) -> Dict[str, Any]:
         """Load user profile and conversation history from memory."""
-        start_time = time.time()
-        
-        try:
-            # TODO: Implement actual memory loading from database
-            # For now, return mock user profile
-            
-            user_id = state.get("user_id", 1)
-            
-            mock_profile = {
-                "name": "Test User",
-                "skills": ["Python", "FastAPI", "Machine Learning"],
-                "experience_years": 5,
-                "target_roles": ["Software Engineer", "ML Engineer"],
-                "preferred_locations": ["Remote", "San Francisco"],
-                "weak_areas": ["System design", "Salary negotiation"]
-            }
-            
-            mock_history = [
-                {
-                    "message": "Previous resume review",
-                    "agent_used": "resume", 
-                    "created_at": "2024-02-05T10:00:00"
-                }
-            ]
-            
-            agents_used = state.get("agents_used", [])
-            agents_used.append("memory_load")
-            
-            return {
-                "user_profile": mock_profile,
-                "conversation_history": mock_history,
-                "agents_used": agents_used,
-                "debug_info": {
-                    "memory_load_time": time.time() - start_time
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "error_message": f"Memory load error: {str(e)}",
-                "agents_used": state.get("agents_used", []) + ["memory_load"]
-            }
+        # TODO: Implement actual memory loading from database
+        # For now, return mock user profile
+        return {
+            "user_profile": dict(_MOCK_PROFILE),
+            "conversation_history": [dict(entry) for entry in _MOCK_HISTORY]
+        }
     
+    @agent_node("resume", "Resume agent error")
     def _resume_agent(self, state: JobCoachState) -> Dict[str, Any]:
         """Resume analysis and improvement agent."""
-        start_time = time.time()
+        # TODO: Implement actual resume analysis
+        # For now, return mock analysis
         
-        try:
-            # TODO: Implement actual resume analysis
-            # For now, return mock analysis
-            
-            resume_text = state.get("resume_text", "")
-            job_description = state.get("job_description", "")
-            
-            if not resume_text:
-                return {
-                    "error_message": "No resume text provided for analysis",
-                    "agents_used": state.get("agents_used", []) + ["resume"]
-                }
-            
-            mock_analysis = {
-                "overall_score": 7.5,
-                "strengths": [
-                    "Clear work experience progression",
-                    "Relevant technical skills listed",
-                    "Good use of action verbs"
-                ],
-                "weaknesses": [
-                    "Missing quantified achievements",
-                    "Could improve professional summary",
-                    "Some outdated technologies mentioned"
-                ],
-                "recommendations": [
-                    "Add specific metrics to accomplishments (e.g., 'Improved performance by 25%')",
-                    "Update skills section with current technologies",
-                    "Tailor experience bullets to target role"
-                ],
-                "ats_compatibility": 8.0,
-                "keyword_analysis": ["API development", "database optimization"] if job_description else None
-            }
-            
-            agents_used = state.get("agents_used", [])
-            agents_used.append("resume")
-            
-            return {
-                "resume_analysis": mock_analysis,
-                "agents_used": agents_used,
-                "debug_info": {
-                    "resume_processing_time": time.time() - start_time,
-                    "resume_length": len(resume_text),
-                    "job_description_provided": bool(job_description)
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "error_message": f"Resume agent error: {str(e)}",
-                "agents_used": state.get("agents_used", []) + ["resume"]
-            }
+        resume_text = state.resume_text
+        job_description = state.job_description
+        
+        if not resume_text:
+            return {"error_message": "No resume text provided for analysis"}
+        
+        return {
+            # Score keyword coverage of the job description on a 0-10 scale
+            "resume_analysis": {
+                **_MOCK_ANALYSIS_WITH_KEYWORDS,
+                "overall_score": round(10 * match_score(resume_text, job_description), 1)
+            } if job_description else dict(_MOCK_ANALYSIS),
+            "debug_info": {
+                "resume_length": len(resume_text),
+                "job_description_provided": bool(job_description)
+            } if DEBUG else None
+        }
     
+    @agent_node("interview", "Interview agent error")
     def _interview_agent(self, state: JobCoachState) -> Dict[str, Any]:
         """Interview practice and evaluation agent.""" 
-        start_time = time.time()
+        # TODO: Implement actual interview logic
+        # For now, return mock interview data
         
-        try:
-            # TODO: Implement actual interview logic
-            # For now, return mock interview data
-            
-            role = state.get("interview_role", "Software Engineer")
-            level = state.get("interview_level", "mid")
-            
-            mock_questions = [
-                {
-                    "id": "q1",
-                    "question": f"Tell me about your experience relevant to {role}.",
-                    "type": "behavioral",
-                    "difficulty": "easy",
-                    "key_points": ["Relevant experience", "Role understanding", "Communication skills"]
-                },
-                {
-                    "id": "q2", 
-                    "question": "Describe a challenging project and how you overcame obstacles.",
-                    "type": "behavioral",
-                    "difficulty": "medium",
-                    "key_points": ["Problem solving", "Persistence", "Technical skills", "Results"]
-                }
-            ]
-            
-            agents_used = state.get("agents_used", [])
-            agents_used.append("interview")
-            
-            return {
-                "interview_questions": mock_questions,
-                "agents_used": agents_used,
-                "debug_info": {
-                    "interview_processing_time": time.time() - start_time,
-                    "questions_generated": len(mock_questions)
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "error_message": f"Interview agent error: {str(e)}",
-                "agents_used": state.get("agents_used", []) + ["interview"]
-            }
+        role = state.interview_role
+        
+        return {
+            "interview_questions": [
+                {**question, "question": question["question"].format(role=role)}
+                for question in _MOCK_QUESTIONS
+            ],
+            "debug_info": {"questions_generated": len(_MOCK_QUESTIONS)} if DEBUG else None
+        }
     
+    @agent_node("job_search", "Job search agent error")
+    @redis_memoize(
+        "job_search",
+        ttl=900,
+        key_fn=lambda state: [
+            state.job_search_query,
+            state.job_search_location,
+            state.resume_text
+        ]
+    )
     def _job_search_agent(self, state: JobCoachState) -> Dict[str, Any]:
         """Job search and discovery agent."""
-        start_time = time.time()
+        # TODO: Implement actual job search
+        # For now, return mock job results
         
-        try:
-            # TODO: Implement actual job search
-            # For now, return mock job results
-            
-            query = state.get("job_search_query", "Software Engineer")
-            location = state.get("job_search_location", "Remote")
-            
-            mock_jobs = [
-                {
-                    "title": f"Senior {query}",
-                    "company": "TechCorp",
-                    "location": location,
-                    "description": f"Seeking experienced {query} professional...",
-                    "url": "https://example.com/job/1",
-                    "salary_range": "$100K-$150K",
-                    "remote_friendly": True,
-                    "match_score": 0.85,
-                    "source": "mock_api"
-                },
-                {
-                    "title": f"Lead {query}",
-                    "company": "InnovateInc", 
-                    "location": "San Francisco, CA",
-                    "description": f"Lead our {query} team...",
-                    "url": "https://example.com/job/2",
-                    "salary_range": "$120K-$180K",
-                    "remote_friendly": False,
-                    "match_score": 0.78,
-                    "source": "mock_api"
-                }
-            ]
-            
-            agents_used = state.get("agents_used", [])
-            agents_used.append("job_search")
-            
-            return {
-                "job_results": mock_jobs,
-                "agents_used": agents_used,
-                "debug_info": {
-                    "job_search_time": time.time() - start_time,
-                    "results_found": len(mock_jobs),
-                    "search_query": query,
-                    "search_location": location
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "error_message": f"Job search agent error: {str(e)}",
-                "agents_used": state.get("agents_used", []) + ["job_search"]
+        query = state.job_search_query
+        location = state.job_search_location
+        
+        params = {"query": query, "location": location}
+        mock_jobs = [
+            {
+                **job,
+                "title": job["title"].format_map(params),
+                "location": job["location"].format_map(params),
+                "description": job["description"].format_map(params)
             }
+            for job in _MOCK_JOBS_TEMPLATE
+        ]
+        
+        # Rank against the user's resume when one was provided
+        resume_text = state.resume_text
+        if resume_text:
+            for job in mock_jobs:
+                job["match_score"] = round(match_score(resume_text, f"{job['title']} {job['description']}"), 2)
+        
+        return {
+            "job_results": mock_jobs,
+            "debug_info": {
+                "results_found": len(mock_jobs),
+                "search_query": query,
+                "search_location": location
+            } if DEBUG else None
+        }
     
+    @agent_node("knowledge", "Knowledge agent error")
+    # Keyed on the normalized question; career-advice answers stay valid for a day
+    @redis_memoize("knowledge", ttl=86400, key_fn=lambda state: _normalize_query(state.knowledge_query))
     def _knowledge_agent(self, state: JobCoachState) -> Dict[str, Any]:
         """Knowledge retrieval (RAG) agent for career advice."""
-        start_time = time.time()
+        # TODO: Implement actual RAG knowledge retrieval
+        # For now, return mock career advice
         
-        try:
-            # TODO: Implement actual RAG knowledge retrieval
-            # For now, return mock career advice
-            
-            query = state.get("knowledge_query", state.get("user_query", ""))
-            
-            mock_answer = """
-            Based on career best practices, here are key recommendations:
-            
-            1. **Build Your Network**: Attend industry events, join professional groups, and maintain active LinkedIn presence.
-            
-            2. **Continuous Learning**: Stay current with industry trends and invest in skill development.
-            
-            3. **Personal Branding**: Clearly articulate your unique value proposition and maintain consistent professional image.
-            
-            4. **Interview Preparation**: Practice common questions, prepare STAR method examples, and research company thoroughly.
-            
-            5. **Salary Negotiation**: Research market rates, document your achievements, and negotiate total compensation package.
-            """
-            
-            mock_sources = [
-                "Career Development Best Practices Guide",
-                "Professional Networking Handbook", 
-                "Interview Success Manual"
-            ]
-            
-            agents_used = state.get("agents_used", [])
-            agents_used.append("knowledge")
-            
-            return {
-                "knowledge_answer": mock_answer,
-                "knowledge_sources": mock_sources,
-                "knowledge_context": "Career advice and best practices",
-                "agents_used": agents_used,
-                "debug_info": {
-                    "knowledge_retrieval_time": time.time() - start_time,
-                    "query_length": len(query),
-                    "sources_found": len(mock_sources)
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "error_message": f"Knowledge agent error: {str(e)}",
-                "agents_used": state.get("agents_used", []) + ["knowledge"]
-            }
+        query = state.knowledge_query
+        
+        return {
+            "knowledge_answer": _MOCK_ANSWER,
+            "knowledge_sources": list(_MOCK_SOURCES),
+            "knowledge_context": "Career advice and best practices",
+            "debug_info": {
+                "query_length": len(query),
+                "sources_found": len(_MOCK_SOURCES)
+            } if DEBUG else None
+        }
     
+    @agent_node("memory_save", "Memory save error")
     def _memory_save_agent(self, state: JobCoachState) -> Dict[str, Any]:
         """Save conversation and update user profile in memory."""
-        start_time = time.time()
+        # TODO: Implement actual memory persistence
+        # For now, just log the save operation
+        return {
+            "debug_info": {
+                "user_id": state.user_id,
+                "session_id": state.session_id,
+                "conversation_saved": True
+            } if DEBUG else None
+        }
+    
+    @agent_node(
+        "summary",
+        "Summary agent error",
+        on_error=lambda e: {
+            "response": f"I encountered an error while generating your response: {_describe_error(e)}",
+            "session_complete": True
+        }
+    )
+    def _summary_agent(self, state: JobCoachState) -> Dict[str, Any]:
+        """Synthesize final response from all agent outputs."""
+        start_time = time.perf_counter_ns()
         
+        return {
+            "response": self._render_response(state),
+            "session_complete": True,
+            "processing_time": _elapsed(start_time)
+        }
+    
+    def _render_response(self, state: JobCoachState) -> str:
+        """Render the user-facing Markdown response for the classified intent."""
+        # Handle error cases
+        if state.error_message:
+            return f"I encountered an error while processing your request: {state.error_message}"
+        
+        # Generate response based on intent and agent outputs
+        return _RESPONSE_RENDERERS.get(state.intent, _render_default)(state)
+    
+    def process_query(self, user_query: str, user_id: int = 1, session_id: str = None, **kwargs) -> Dict[str, Any]:
+        """Process a user query through the complete workflow."""
+        # Blank submissions get a canned reply without touching the graph
+        if not user_query or not user_query.strip():
+            return self._empty_query_state(session_id)
+        
+        initial_state = self._build_initial_state(user_query, user_id, session_id, **kwargs)
+        
+        # Run the workflow
         try:
-            # TODO: Implement actual memory persistence
-            # For now, just log the save operation
-            
-            user_id = state.get("user_id", 1)
-            session_id = state.get("session_id", "unknown")
-            
-            agents_used = state.get("agents_used", [])
-            agents_used.append("memory_save")
-            
-            return {
-                "agents_used": agents_used,
-                "debug_info": {
-                    "memory_save_time": time.time() - start_time,
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "conversation_saved": True
-                }
-            }
-            
+            return self.graph.invoke(initial_state)
         except Exception as e:
-            return {
-                "error_message": f"Memory save error: {str(e)}",
-                "agents_used": state.get("agents_used", []) + ["memory_save"]
-            }
+            return self._error_state(initial_state, e)
     
-    def _summary_agent(self, state: JobCoachState) -> Dict[str, Any]:
-        """Synthesize final response from all agent outputs."""
-        start_time = time.time()
+    def stream_query(self, user_query: str, user_id: int = 1, session_id: str = None, **kwargs) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Process a query, yielding (node, update) pairs as each node finishes.
+        
+        Lets callers forward the summary response as soon as it is rendered instead
+        of waiting for memory_save and the final state.
+        """
+        # Blank submissions get the canned reply as a single summary update
+        if not user_query or not user_query.strip():
+            yield "summary", self._empty_query_state(session_id)
+            return
+        
+        initial_state = self._build_initial_state(user_query, user_id, session_id, **kwargs)
         
         try:
-            intent = state.get("intent", "unknown")
-            error_message = state.get("error_message")
-            
-            # Handle error cases
-            if error_message:
-                response = f"I encountered an error while processing your request: {error_message}"
-                return {
-                    "response": response,
-                    "session_complete": True,
-                    "processing_time": time.time() - start_time,
-                    "agents_used": state.get("agents_used", []) + ["summary"]
-                }
-            
-            # Generate response based on intent and agent outputs
-            response = ""
-            
-            if intent == "resume_analysis":
-                analysis = state.get("resume_analysis", {})
-                if analysis:
-                    score = analysis.get("overall_score", 0)
-                    strengths = analysis.get("strengths", [])
-                    recommendations = analysis.get("recommendations", [])
-                    
-                    response = f"""
-## Resume Analysis Results
-
-**Overall Score: {score}/10**
-
-### Strengths:
-{chr(10).join('• ' + s for s in strengths[:3])}
-
-### Key Recommendations:
-{chr(10).join('• ' + r for r in recommendations[:3])}
-
-Your resume shows good potential with some areas for improvement. Focus on quantifying your achievements and tailoring content to specific roles.
-                    """.strip()
-                else:
-                    response = "I was unable to analyze your resume. Please ensure you've provided valid resume text."
-            
-            elif intent == "interview_practice":
-                questions = state.get("interview_questions", [])
-                if questions:
-                    first_question = questions[0]
-                    response = f"""
-## Interview Practice Session Started
-
-**Role**: {state.get('interview_role', 'Software Engineer')}
-**Level**: {state.get('interview_level', 'mid')}
-
-### First Question:
-{first_question.get('question', 'Tell me about yourself.')}
-
-**Type**: {first_question.get('type', 'behavioral')}
-**Key Points to Cover**: {', '.join(first_question.get('key_points', []))}
-
-Take your time to provide a thoughtful answer. I'll give you detailed feedback and follow up with additional questions.
-                    """.strip()
-                else:
-                    response = "I'm ready to start your interview practice session. What role would you like to practice for?"
-            
-            elif intent == "job_search":
-                jobs = state.get("job_results", [])
-                if jobs:
-                    job_list = ""
-                    for i, job in enumerate(jobs[:3], 1):
-                        job_list += f"""
-{i}. **{job.get('title', 'Unknown Title')}** at {job.get('company', 'Unknown Company')}
-   Location: {job.get('location', 'Unknown')}
-   Salary: {job.get('salary_range', 'Not specified')}
-   Match Score: {job.get('match_score', 0):.0%}
-"""
-                    
-                    response = f"""
-## Job Search Results
-
-Found {len(jobs)} relevant opportunities:
-
-{job_list.strip()}
-
-These positions match your profile based on skills and experience. Would you like me to help you prepare application materials for any of these roles?
-                    """.strip()
-                else:
-                    response = "I couldn't find any job opportunities matching your criteria. Try adjusting your search terms or location."
-            
-            elif intent == "career_advice":
-                answer = state.get("knowledge_answer", "")
-                sources = state.get("knowledge_sources", [])
-                
-                if answer:
-                    response = f"""
-## Career Advice
-
-{answer}
-
----
-*Sources: {', '.join(sources)}*
-                    """.strip()
-                else:
-                    response = "I'd be happy to help with career advice. Could you be more specific about what you'd like guidance on?"
-            
-            else:
-                response = "I understand you're looking for career assistance. I can help with resume reviews, interview practice, job searches, and career advice. What would you like to work on?"
-            
-            agents_used = state.get("agents_used", [])
-            agents_used.append("summary")
-            
-            return {
-                "response": response,
-                "session_complete": True,
-                "processing_time": time.time() - start_time,
-                "agents_used": agents_used
-            }
-            
+            for chunk in self.graph.stream(initial_state, stream_mode="updates"):
+                for node, update in chunk.items():
+                    yield node, update or {}
         except Exception as e:
-            return {
-                "response": f"I encountered an error while generating your response: {str(e)}",
-                "session_complete": True,
-                "error_message": f"Summary agent error: {str(e)}",
-                "agents_used": state.get("agents_used", []) + ["summary"]
-            }
+            yield "error_handler", self._error_state(initial_state, e)
     
-    def process_query(self, user_query: str, user_id: int = 1, session_id: str = None, **kwargs) -> Dict[str, Any]:
-        """Process a user query through the complete workflow."""
+    async def aprocess_query(self, user_query: str, user_id: int = 1, session_id: str = None, **kwargs) -> Dict[str, Any]:
+        """Async variant of process_query for use from request handlers.
+        
+        The nodes are synchronous, so the run is moved to a worker thread to keep
+        the event loop free for other requests.
+        """
+        return await asyncio.to_thread(self.process_query, user_query, user_id, session_id, **kwargs)
+    
+    def process_queries(self, queries: List[Dict[str, Any]], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Process several queries concurrently through the workflow.
+        
+        Each item holds process_query arguments (user_query plus optional user_id,
+        session_id and keyword fields). Results are returned in input order.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        pending = []
+        for index, query in enumerate(queries):
+            user_query = query.get("user_query")
+            if not user_query or not user_query.strip():
+                results[index] = self._empty_query_state(query.get("session_id"))
+            else:
+                pending.append(index)
+        
+        initial_states = [self._build_initial_state(**queries[index]) for index in pending]
+        
+        if initial_states:
+            outputs = self.graph.batch(
+                initial_states,
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
+            )
+            for index, state, output in zip(pending, initial_states, outputs):
+                results[index] = self._error_state(state, output) if isinstance(output, Exception) else output
+        return results
+    
+    async def aprocess_queries(self, queries: List[Dict[str, Any]], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Async variant of process_queries; runs the batch in a worker thread."""
+        return await asyncio.to_thread(self.process_queries, queries, max_concurrency)
+    
+    def _build_initial_state(self, user_query: str, user_id: int = 1, session_id: str = None, **kwargs) -> Dict[str, Any]:
+        """Build the initial workflow state for a query from the shared template."""
         if session_id is None:
-            session_id = f"session_{int(time.time())}"
+            # Monotonic clock plus random suffix keeps IDs unique across processes
+            session_id = f"session_{time.monotonic_ns():x}{os.urandom(2).hex()}"
         
-        # Initialize state
-        initial_state: JobCoachState = {
-            "user_query": user_query,
-            "user_id": user_id, 
+        initial_state = _INITIAL_STATE_TEMPLATE.copy()
+        initial_state["user_query"] = user_query
+        initial_state["user_id"] = user_id
+        initial_state["session_id"] = session_id
+        initial_state["knowledge_query"] = user_query
+        for key in _LIST_FIELDS:
+            initial_state[key] = []
+        initial_state.update({k: v for k, v in kwargs.items() if k in _INPUT_KWARGS})
+        return initial_state
+    
+    @staticmethod
+    def _error_state(initial_state: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Final state returned when the workflow itself fails; updates initial_state in place."""
+        detail = _describe_error(error)
+        initial_state["response"] = f"I encountered a system error while processing your request: {detail}"
+        initial_state["error_message"] = f"Workflow error: {detail}"
+        initial_state["session_complete"] = True
+        initial_state["agents_used"] = ["error_handler"]
+        return initial_state
+    
+    @staticmethod
+    def _empty_query_state(session_id: Optional[str]) -> Dict[str, Any]:
+        """Final state returned for a blank query, which never reaches the graph."""
+        return {
             "session_id": session_id,
-            "intent": "",
-            "confidence": 0.0,
-            "resume_text": kwargs.get("resume_text"),
-            "job_description": kwargs.get("job_description"),
-            "resume_analysis": None,
-            "resume_suggestions": None,
-            "interview_role": kwargs.get("interview_role"),
-            "interview_level": kwargs.get("interview_level"),
-            "interview_questions": [],
-            "interview_answers": [],
-            "interview_feedback": None,
-            "interview_session_id": kwargs.get("interview_session_id"),
-            "job_search_query": kwargs.get("job_search_query"),
-            "job_search_location": kwargs.get("job_search_location"),
-            "job_search_level": kwargs.get("job_search_level"),
-            "job_results": [],
-            "knowledge_query": kwargs.get("knowledge_query", user_query),
-            "knowledge_context": None,
-            "knowledge_sources": [],
-            "knowledge_answer": None,
-            "user_profile": None,
-            "conversation_history": [],
-            "profile_updates": None,
-            "agent_messages": [],
-            "shared_context": None,
-            "response": "",
-            "next_action": None,
-            "session_complete": False,
-            "processing_time": 0.0,
-            "agents_used": [],
+            "response": "Please enter a question or request.",
             "error_message": None,
-            "debug_info": None
+            "session_complete": True,
+            "processing_time": 0.0,
+            "agents_used": []
         }
-        
-        # Run the workflow
-        try:
-            final_state = self.graph.invoke(initial_state)
-            return final_state
-        except Exception as e:
-            return {
-                **initial_state,
-                "response": f"I encountered a system error while processing your request: {str(e)}",
-                "error_message": f"Workflow error: {str(e)}",
-                "session_complete": True,
-                "agents_used": ["error_handler"]
-            }
-
-
-# Global workflow instance
-workflow = JobCoachWorkflow()
 
 
+@lru_cache(maxsize=1)
 def get_workflow() -> JobCoachWorkflow:
-    """Get the global workflow instance."""
-    return workflow
\ No newline at end of file
+    """Get the global workflow instance, building it on first use."""
+    return JobCoachWorkflow()
\ No newline at end of file
@@ -1,16 +1,27 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Optional, List, Dict, Any
 import uvicorn
+import asyncio
+import orjson
+import logging
 import os
+import queue
 import time
 import uuid
 from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 # Import our modules
 from app.tools.database import init_db, close_db, get_db, DatabaseManager
+from app.graph.workflow import get_workflow
+from app.tools.cache import get_cache
+
+logger = logging.getLogger(__name__)
 
 # Pydantic models for request/response
 class HealthResponse(BaseModel):
@@ -123,6 +134,9 @@ class ApplicationResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+# Validates a whole list of application rows in one pass
+_APPLICATIONS_ADAPTER = TypeAdapter(List[ApplicationResponse])
+
 class ApplicationUpdateRequest(BaseModel):
     status: Optional[str] = Field(None, pattern="^(applied|interviewing|offer|rejected|withdrawn)$")
     notes: Optional[str]
@@ -134,46 +148,114 @@ class AsyncTaskResponse(BaseModel):
     message: str
     estimated_completion: Optional[datetime]
 
+class ASGITimingMiddleware:
+    """Pure ASGI middleware adding an x-response-time header (seconds) to HTTP responses.
+    
+    Avoids BaseHTTPMiddleware, which allocates Request/Response objects and an extra
+    task per request.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                elapsed = f"{time.perf_counter() - start_time:.6f}".encode()
+                message["headers"] = [*message.get("headers", []), (b"x-response-time", elapsed)]
+            await send(message)
+        
+        await self.app(scope, receive, send_with_timing)
+
 # Application lifespan management
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    print("Starting AI Job Application Coach...")
+    # Startup: hand log records to a background thread so request handlers never
+    # block on writing to stdout/stderr
+    root_logger = logging.getLogger()
+    original_handlers = root_logger.handlers[:]
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, *original_handlers, respect_handler_level=True)
+    root_logger.handlers = [QueueHandler(log_queue)]
+    log_listener.start()
+    
+    logger.info("Starting AI Job Application Coach...")
+    
+    # Python 3.12+: tasks that finish without suspending skip the scheduler round-trip
+    loop = asyncio.get_running_loop()
+    if hasattr(asyncio, "eager_task_factory"):
+        loop.set_task_factory(asyncio.eager_task_factory)
+    
+    # Workflow runs and DB calls go through asyncio.to_thread; the default pool
+    # (min(32, CPUs + 4) threads) starves when many LLM calls are in flight
+    loop.set_default_executor(ThreadPoolExecutor(
+        max_workers=int(os.getenv("API_THREAD_POOL_SIZE", 64)),
+        thread_name_prefix="jobcoach"
+    ))
+    
     try:
         init_db()
-        print("Database initialized successfully")
+        logger.info("Database initialized successfully")
     except Exception as e:
-        print(f"Warning: Database initialization failed: {e}")
+        logger.warning(f"Database initialization failed: {e}")
+    
+    # Build the OpenAPI schema now so the first /docs request doesn't pay for it
+    app.openapi()
     
     yield
     
     # Shutdown
-    print("Shutting down AI Job Application Coach...")
+    logger.info("Shutting down AI Job Application Coach...")
     try:
         close_db()
-        print("Database connection closed")
+        logger.info("Database connection closed")
     except Exception as e:
-        print(f"Warning: Error during shutdown: {e}")
+        logger.warning(f"Error during shutdown: {e}")
+    
+    # Flush queued records and restore direct logging
+    log_listener.stop()
+    root_logger.handlers = original_handlers
 
 # Create FastAPI application
 app = FastAPI(
     title="AI Job Application Coach",
     description="Multi-agent career coaching system powered by LangGraph",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # orjson encodes JSON bodies in native code
 )
 
-# Add CORS middleware
+# Add CORS middleware. A fixed origin list lets Starlette answer from a static
+# header set; credentials are only allowed when origins are listed explicitly,
+# since a wildcard origin with credentials forces per-request Origin echoing.
+cors_origins = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_origins=cors_origins,
+    allow_credentials="*" not in cors_origins,
+    allow_methods=["GET", "POST", "PUT"],
     allow_headers=["*"],
 )
 
-# Dependency to get database
-def get_database():
+# Added last so it is outermost and times the whole middleware stack
+app.add_middleware(ASGITimingMiddleware)
+
+# Last-resort handler: log the traceback server-side and return a generic 500
+# instead of echoing exception text to clients
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    logger.exception(f"Unhandled error on {request.method} {request.url.path}")
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
+
+# Dependency to get database; async so FastAPI doesn't hop to a worker thread
+# just to return the shared instance
+async def get_database():
     """Dependency to get database instance."""
     return get_db()
 
@@ -183,12 +265,12 @@ async def health_check(db: DatabaseManager = Depends(get_database)):
     """Health check endpoint to verify service status."""
     database_connected = False
     try:
-        db.ensure_connection()
+        await asyncio.to_thread(db.ensure_connection)
         # Test database with simple query
-        result = db.execute_query("SELECT 1 as test")
+        result = await asyncio.to_thread(db.execute_query, "SELECT 1 as test")
         database_connected = result is not None
     except Exception as e:
-        print(f"Database health check failed: {e}")
+        logger.warning(f"Database health check failed: {e}")
     
     return HealthResponse(
         status="healthy",
@@ -199,17 +281,27 @@ async def health_check(db: DatabaseManager = Depends(get_database)):
 
 # Resume analysis endpoints
 @app.post("/resume", response_model=ResumeResponse)
-async def analyze_resume(request: ResumeRequest, db: DatabaseManager = Depends(get_database)):
+async def analyze_resume(request: ResumeRequest, background_tasks: BackgroundTasks, db: DatabaseManager = Depends(get_database)):
     """Analyze resume and provide improvement feedback."""
     start_time = time.time()
     
     try:
-        # TODO: Implement resume analysis using LangGraph workflow
-        # For now, return a mock response
-        
-        # Save conversation to database
+        # Run the resume branch of the LangGraph workflow off the event loop
         session_id = str(uuid.uuid4())
-        db.save_conversation(
+        result = await get_workflow().aprocess_query(
+            "Analyze my resume",
+            user_id=request.user_id,
+            session_id=session_id,
+            resume_text=request.resume_text,
+            job_description=request.job_description
+        )
+        analysis = result.get("resume_analysis")
+        if not analysis:
+            raise HTTPException(status_code=500, detail=result.get("error_message") or "Resume analysis failed")
+        
+        # Save conversation after the response is sent; the client doesn't need the row
+        background_tasks.add_task(
+            db.save_conversation,
             user_id=request.user_id,
             session_id=session_id,
             message=f"Resume analysis request: {len(request.resume_text)} characters",
@@ -220,20 +312,19 @@ async def analyze_resume(request: ResumeRequest, db: DatabaseManager = Depends(g
         
         processing_time = time.time() - start_time
         
-        return ResumeResponse(
-            overall_score=7.5,
-            strengths=["Clear work experience section", "Relevant technical skills"],
-            weaknesses=["Missing quantified achievements", "Could improve summary section"],
-            recommendations=[
-                "Add specific metrics to accomplishments",
-                "Include relevant keywords from job description",
-                "Improve professional summary with value proposition"
-            ],
-            ats_compatibility=8.0,
-            keyword_analysis=["Python", "APIs", "databases"] if request.job_description else None,
+        # Workflow output is already well-typed; FastAPI validates against response_model on the way out
+        return ResumeResponse.model_construct(
+            overall_score=analysis["overall_score"],
+            strengths=list(analysis["strengths"]),
+            weaknesses=list(analysis["weaknesses"]),
+            recommendations=list(analysis["recommendations"]),
+            ats_compatibility=analysis["ats_compatibility"],
+            keyword_analysis=list(analysis["keyword_analysis"]) if analysis.get("keyword_analysis") else None,
             processing_time=processing_time
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Resume analysis failed: {str(e)}")
 
@@ -260,7 +351,8 @@ async def start_interview_session(request: InterviewStartRequest, db: DatabaseMa
         session_id = str(uuid.uuid4())
         
         # Create interview session in database
-        db.create_interview_session(
+        await asyncio.to_thread(
+            db.create_interview_session,
             user_id=request.user_id,
             session_id=session_id,
             role=request.role,
@@ -294,7 +386,7 @@ async def submit_interview_answer(request: InterviewAnswerRequest, db: DatabaseM
     """Submit answer to interview question and get feedback."""
     try:
         # Get interview session
-        session = db.get_interview_session(request.session_id)
+        session = await asyncio.to_thread(db.get_interview_session, request.session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Interview session not found")
         
@@ -332,12 +424,13 @@ async def submit_interview_answer(request: InterviewAnswerRequest, db: DatabaseM
 
 # Knowledge query endpoint
 @app.post("/ask", response_model=KnowledgeQueryResponse)
-async def ask_career_question(request: KnowledgeQueryRequest, db: DatabaseManager = Depends(get_database)):
+async def ask_career_question(request: KnowledgeQueryRequest, background_tasks: BackgroundTasks, db: DatabaseManager = Depends(get_database)):
     """Ask career-related questions and get advice from knowledge base."""
     try:
-        # Save conversation
+        # Save conversation after the response is sent; the client doesn't need the row
         session_id = str(uuid.uuid4())
-        db.save_conversation(
+        background_tasks.add_task(
+            db.save_conversation,
             user_id=request.user_id,
             session_id=session_id,
             message=request.query,
@@ -366,8 +459,9 @@ async def search_jobs(request: JobSearchRequest, db: DatabaseManager = Depends(g
         # TODO: Implement job search using LangGraph workflow
         # For now, return mock results
         
+        # Built from trusted values; validation happens once via response_model
         mock_jobs = [
-            JobListing(
+            JobListing.model_construct(
                 title=f"Senior {request.query}",
                 company="TechCorp Inc.",
                 location=request.location,
@@ -376,7 +470,7 @@ async def search_jobs(request: JobSearchRequest, db: DatabaseManager = Depends(g
                 salary_range="$80K-$120K",
                 remote_friendly=request.remote_ok
             ),
-            JobListing(
+            JobListing.model_construct(
                 title=f"{request.experience_level.title()} {request.query}",
                 company="StartupXYZ",
                 location="Remote",
@@ -387,7 +481,7 @@ async def search_jobs(request: JobSearchRequest, db: DatabaseManager = Depends(g
             )
         ]
         
-        return JobSearchResponse(
+        return JobSearchResponse.model_construct(
             jobs=mock_jobs,
             total_found=len(mock_jobs),
             search_query=request.query,
@@ -404,7 +498,8 @@ async def create_application(request: ApplicationCreateRequest, db: DatabaseMana
     try:
         application_date = request.application_date or datetime.now().date()
         
-        application_id = db.create_application(
+        application_id = await asyncio.to_thread(
+            db.create_application,
             user_id=request.user_id,
             company_name=request.company_name,
             position_title=request.position_title,
@@ -439,25 +534,10 @@ async def create_application(request: ApplicationCreateRequest, db: DatabaseMana
 async def get_applications(user_id: int = 1, status: Optional[str] = None, db: DatabaseManager = Depends(get_database)):
     """Get user's job applications, optionally filtered by status."""
     try:
-        applications = db.get_applications(user_id=user_id, status=status)
-        
-        # Convert to response model (handle potential None dates)
-        response_applications = []
-        for app in applications:
-            response_applications.append(ApplicationResponse(
-                id=app['id'],
-                company_name=app['company_name'],
-                position_title=app['position_title'], 
-                job_url=app['job_url'],
-                status=app['status'],
-                application_date=app['application_date'],
-                follow_up_date=app['follow_up_date'],
-                notes=app['notes'],
-                created_at=app['created_at'],
-                updated_at=app['updated_at']
-            ))
+        applications = await asyncio.to_thread(db.get_applications, user_id=user_id, status=status)
         
-        return response_applications
+        # Convert rows to response models in one validation pass (extra columns are ignored)
+        return _APPLICATIONS_ADAPTER.validate_python(applications)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve applications: {str(e)}")
@@ -465,37 +545,32 @@ async def get_applications(user_id: int = 1, status: Optional[str] = None, db: D
 @app.put("/applications/{application_id}", response_model=ApplicationResponse)
 async def update_application(application_id: int, request: ApplicationUpdateRequest, db: DatabaseManager = Depends(get_database)):
     """Update job application status and details."""
-    try:
-        # TODO: Implement application update
-        # For now, return mock response
-        
-        success = db.update_application_status(
-            application_id=application_id,
-            status=request.status or "applied",
-            notes=request.notes
-        )
-        
-        if not success:
-            raise HTTPException(status_code=404, detail="Application not found")
-        
-        # Return mock updated application
-        return ApplicationResponse(
-            id=application_id,
-            company_name="Example Company",
-            position_title="Software Engineer",
-            job_url=None,
-            status=request.status or "applied",
-            application_date=date.today(),
-            follow_up_date=request.follow_up_date,
-            notes=request.notes,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to update application: {str(e)}")
+    # TODO: Implement application update
+    # For now, return mock response
+    
+    success = await asyncio.to_thread(
+        db.update_application_status,
+        application_id=application_id,
+        status=request.status or "applied",
+        notes=request.notes
+    )
+    
+    if not success:
+        raise HTTPException(status_code=404, detail="Application not found")
+    
+    # Return mock updated application; validated once via response_model
+    return ApplicationResponse.model_construct(
+        id=application_id,
+        company_name="Example Company",
+        position_title="Software Engineer",
+        job_url=None,
+        status=request.status or "applied",
+        application_date=date.today(),
+        follow_up_date=request.follow_up_date,
+        notes=request.notes,
+        created_at=datetime.now(),
+        updated_at=datetime.now()
+    )
 
 # Async task result endpoint
 @app.get("/result/{task_id}")
@@ -513,30 +588,61 @@ async def get_task_result(task_id: str):
     }
 
 # User profile endpoints
+
+# Seconds a cached profile may be served before it is re-read from MySQL
+USER_PROFILE_CACHE_TTL = 30
+
+def _profile_etag(updated_at: Any) -> str:
+    """Weak ETag for a profile; cached profiles carry updated_at as an ISO string."""
+    stamp = updated_at.isoformat() if isinstance(updated_at, datetime) else updated_at
+    return f'W/"{stamp}"'
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return an empty 304 if the client already holds `etag`, else tag `response` with it."""
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=10"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 @app.get("/user/{user_id}/profile")
-async def get_user_profile(user_id: int, db: DatabaseManager = Depends(get_database)):
+async def get_user_profile(user_id: int, request: Request, response: Response, db: DatabaseManager = Depends(get_database)):
     """Get user profile data."""
-    try:
-        user = db.get_user(user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        return {
-            "id": user["id"],
-            "email": user["email"],
-            "profile_data": user.get("profile_data", {}),
-            "preferences": user.get("preferences", {}),
-            "created_at": user["created_at"],
-            "updated_at": user["updated_at"]
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get user profile: {str(e)}")
+    # Profiles are re-read on every interaction; serve repeats from Redis briefly
+    cache = get_cache()
+    cache_key = f"jobcoach:user_profile:{user_id}"
+    cached = await asyncio.to_thread(cache.get, cache_key)
+    if cached is not None:
+        profile = orjson.loads(cached)
+        return _not_modified(request, response, _profile_etag(profile["updated_at"])) or profile
+    
+    user = await asyncio.to_thread(db.get_user, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    profile = {
+        "id": user["id"],
+        "email": user["email"],
+        "profile_data": user.get("profile_data", {}),
+        "preferences": user.get("preferences", {}),
+        "created_at": user["created_at"],
+        "updated_at": user["updated_at"]
+    }
+    await asyncio.to_thread(cache.set, cache_key, orjson.dumps(profile, default=str), USER_PROFILE_CACHE_TTL)
+    return _not_modified(request, response, _profile_etag(profile["updated_at"])) or profile
 
 if __name__ == "__main__":
     port = int(os.getenv("API_PORT", 8000))
     host = os.getenv("API_HOST", "0.0.0.0")
+    # The reloader adds a file-watcher process; enable it only for development
+    reload = os.getenv("API_RELOAD", "0") == "1"
     
-    uvicorn.run(app, host=host, port=port, reload=True)
\ No newline at end of file
+    # uvloop and httptools ship with uvicorn[standard]; uvloop has no Windows build
+    uvicorn.run(
+        "app.main:app",
+        host=host,
+        port=port,
+        reload=reload,
+        loop="asyncio" if os.name == "nt" else "uvloop",
+        http="httptools"
+    )
\ No newline at end of file
@@ -0,0 +1,110 @@
+import redis
+import hashlib
+import orjson
+import os
+import random
+import time
+import functools
+from typing import Optional, Any, Callable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Same switch as app.graph.workflow.DEBUG; cache-hit markers are debug-only
+DEBUG = os.getenv("JOBCOACH_DEBUG") == "1"
+
+
+class CacheManager:
+    """Redis connection and key/value operations for cross-process caching."""
+
+    # Seconds to wait before retrying after Redis became unreachable
+    RETRY_INTERVAL = 30
+
+    def __init__(self):
+        """Initialize Redis connection parameters from environment variables."""
+        self.host = os.getenv('REDIS_HOST', 'localhost')
+        self.port = int(os.getenv('REDIS_PORT', 6379))
+        self.db = int(os.getenv('REDIS_CACHE_DB', 1))
+        self.client = None
+        self._retry_after = 0.0
+
+    def connect(self) -> Optional[redis.Redis]:
+        """Return a Redis client, or None while Redis is marked unavailable."""
+        if time.time() < self._retry_after:
+            return None
+        if self.client is None:
+            self.client = redis.Redis(
+                host=self.host,
+                port=self.port,
+                db=self.db,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5
+            )
+        return self.client
+
+    def _mark_unavailable(self, error: Exception):
+        """Skip Redis for RETRY_INTERVAL seconds after a connection failure."""
+        logger.warning(f"Redis cache unavailable: {error}")
+        self.client = None
+        self._retry_after = time.time() + self.RETRY_INTERVAL
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a raw cached value, or None on miss or error."""
+        client = self.connect()
+        if client is None:
+            return None
+        try:
+            return client.get(key)
+        except redis.RedisError as e:
+            self._mark_unavailable(e)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: int) -> bool:
+        """Store a value with a TTL in seconds."""
+        client = self.connect()
+        if client is None:
+            return False
+        try:
+            return bool(client.setex(key, ttl, value))
+        except redis.RedisError as e:
+            self._mark_unavailable(e)
+            return False
+
+
+# Global cache instance
+cache = CacheManager()
+
+
+def get_cache() -> CacheManager:
+    """Get the global cache instance."""
+    return cache
+
+
+def redis_memoize(prefix: str, ttl: int, key_fn: Callable[[Any], Any]):
+    """Memoize a workflow node in Redis, keyed on the state slice chosen by key_fn.
+
+    Error results and per-call bookkeeping (agents_used, debug_info) are never cached.
+    Each write's TTL gets up to 10% random jitter so entries filled together don't
+    all expire, and get recomputed, at the same moment.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, state):
+            # Hash the key material so long inputs (e.g. resume text) keep keys short
+            digest = hashlib.blake2b(orjson.dumps(key_fn(state), default=str), digest_size=16).hexdigest()
+            key = f"jobcoach:{prefix}:{digest}"
+
+            raw = cache.get(key)
+            if raw is not None:
+                result = orjson.loads(raw)
+                if DEBUG:
+                    result["debug_info"] = {f"{prefix}_cache_hit": True}
+                return result
+
+            result = fn(self, state)
+            if not result.get("error_message"):
+                payload = {k: v for k, v in result.items() if k not in ("agents_used", "debug_info")}
+                cache.set(key, orjson.dumps(payload, default=str), ttl + random.randint(0, ttl // 10))
+            return result
+        return wrapper
+    return decorator
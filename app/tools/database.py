@@ -2,6 +2,7 @@ import mysql.connector
 from mysql.connector import Error
 import json
 import os
+import threading
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 import logging
@@ -21,6 +22,8 @@ class DatabaseManager:
         self.password = os.getenv('MYSQL_PASSWORD', '')
         self.database = os.getenv('MYSQL_DATABASE', 'job_coach')
         self.connection = None
+        # Serializes use of the shared connection when called from worker threads
+        self._lock = threading.RLock()
         
     def connect(self):
         """Establish database connection."""
@@ -50,62 +53,66 @@ class DatabaseManager:
     
     def ensure_connection(self):
         """Ensure database connection is active."""
-        try:
-            if not self.connection or not self.connection.is_connected():
+        with self._lock:
+            try:
+                if not self.connection or not self.connection.is_connected():
+                    self.connect()
+            except Error:
                 self.connect()
-        except Error:
-            self.connect()
     
     def execute_query(self, query: str, params: tuple = None) -> Optional[List[Dict]]:
         """Execute a SELECT query and return results as list of dictionaries."""
-        try:
-            self.ensure_connection()
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            cursor.close()
-            return results
-        except Error as e:
-            logger.error(f"Error executing query: {e}")
-            return None
+        with self._lock:
+            try:
+                self.ensure_connection()
+                cursor = self.connection.cursor(dictionary=True)
+                cursor.execute(query, params)
+                results = cursor.fetchall()
+                cursor.close()
+                return results
+            except Error as e:
+                logger.error(f"Error executing query: {e}")
+                return None
     
     def execute_update(self, query: str, params: tuple = None) -> Optional[int]:
         """Execute INSERT/UPDATE/DELETE query and return affected rows or last insert ID."""
-        try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute(query, params)
-            self.connection.commit()
+        with self._lock:
+            try:
+                self.ensure_connection()
+                cursor = self.connection.cursor()
+                cursor.execute(query, params)
+                self.connection.commit()
             
-            # For INSERT operations, return the last insert ID
-            if query.strip().upper().startswith('INSERT'):
-                result = cursor.lastrowid
-            else:
-                result = cursor.rowcount
+                # For INSERT operations, return the last insert ID
+                if query.strip().upper().startswith('INSERT'):
+                    result = cursor.lastrowid
+                else:
+                    result = cursor.rowcount
                 
-            cursor.close()
-            return result
-        except Error as e:
-            logger.error(f"Error executing update: {e}")
-            if self.connection:
-                self.connection.rollback()
-            return None
+                cursor.close()
+                return result
+            except Error as e:
+                logger.error(f"Error executing update: {e}")
+                if self.connection:
+                    self.connection.rollback()
+                return None
     
     def execute_many(self, query: str, params_list: List[tuple]) -> Optional[int]:
         """Execute multiple queries with different parameters."""
-        try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.executemany(query, params_list)
-            self.connection.commit()
-            affected_rows = cursor.rowcount
-            cursor.close()
-            return affected_rows
-        except Error as e:
-            logger.error(f"Error executing batch query: {e}")
-            if self.connection:
-                self.connection.rollback()
-            return None
+        with self._lock:
+            try:
+                self.ensure_connection()
+                cursor = self.connection.cursor()
+                cursor.executemany(query, params_list)
+                self.connection.commit()
+                affected_rows = cursor.rowcount
+                cursor.close()
+                return affected_rows
+            except Error as e:
+                logger.error(f"Error executing batch query: {e}")
+                if self.connection:
+                    self.connection.rollback()
+                return None
     
     # User management methods
     def create_user(self, email: str, profile_data: Dict = None, preferences: Dict = None) -> Optional[int]:
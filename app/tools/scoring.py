@@ -0,0 +1,64 @@
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Word tokens keeping tech spellings like "c++", "c#" and "node.js"
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+# Function words and posting filler that say nothing about a candidate's fit
+_STOPWORDS = frozenset({
+    "a", "about", "all", "also", "an", "and", "any", "are", "as", "at", "be", "been",
+    "but", "by", "can", "do", "does", "for", "from", "had", "has", "have", "i", "in",
+    "into", "is", "it", "its", "looking", "me", "must", "my", "need", "needs", "not",
+    "of", "on", "or", "our", "over", "seeking", "should", "so", "such", "that", "the",
+    "their", "them", "they", "this", "those", "to", "us", "was", "we", "were", "what",
+    "which", "who", "will", "with", "would", "you", "your"
+})
+
+
+@lru_cache(maxsize=1)
+def _overlap_kernel():
+    """Build the overlap-count kernel on first use, so importing this module loads
+    neither numpy nor numba; it is Numba-compiled when numba is installed."""
+    import numpy as np
+
+    def overlap_count(left, right):
+        """Count values of `left` present in `right`; both must be sorted and unique."""
+        count = 0
+        for i in range(left.shape[0]):
+            j = np.searchsorted(right, left[i])
+            if j < right.shape[0] and right[j] == left[i]:
+                count += 1
+        return count
+
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional; fall back to plain Python
+        return overlap_count
+    return njit(cache=True)(overlap_count)
+
+
+def token_hashes(text: Optional[str]) -> "np.ndarray":
+    """Hash the lowercased keyword tokens of `text` into a sorted unique int64 array.
+    
+    Stopwords and single characters are dropped so only meaningful terms count.
+    """
+    import numpy as np
+
+    tokens = [
+        token for token in _TOKEN_RE.findall((text or "").lower())
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+    return np.unique(np.fromiter((hash(token) for token in tokens), dtype=np.int64, count=len(tokens)))
+
+
+def match_score(candidate_text: Optional[str], target_text: Optional[str]) -> float:
+    """Fraction of the target's distinct keywords that appear in the candidate text (0.0-1.0)."""
+    target = token_hashes(target_text)
+    if target.shape[0] == 0:
+        return 0.0
+    candidate = token_hashes(candidate_text)
+    return _overlap_kernel()(target, candidate) / target.shape[0]
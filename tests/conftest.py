@@ -0,0 +1,12 @@
+import pytest
+
+from app.tools import cache as cache_module
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    """Replace Redis with an in-memory dict and return that dict."""
+    store = {}
+    monkeypatch.setattr(cache_module.cache, "get", store.get)
+    monkeypatch.setattr(cache_module.cache, "set", lambda key, value, ttl: store.__setitem__(key, value) or True)
+    return store
@@ -0,0 +1,53 @@
+
+from app.tools import cache as cache_module
+from app.tools.cache import redis_memoize
+
+
+class _Node:
+    def __init__(self):
+        self.calls = 0
+
+    @redis_memoize("test", ttl=60, key_fn=lambda state: state["query"])
+    def run(self, state):
+        self.calls += 1
+        if state["query"] == "fail":
+            return {"error_message": "boom"}
+        return {"answer": state["query"].upper(), "agents_used": ["test"], "debug_info": {"test_time": 0.1}}
+
+
+def test_miss_then_hit(fake_cache):
+    node = _Node()
+    first = node.run({"query": "hello"})
+    second = node.run({"query": "hello"})
+
+    assert node.calls == 1
+    assert first["answer"] == second["answer"] == "HELLO"
+    assert len(fake_cache) == 1
+
+
+def test_hit_omits_per_call_bookkeeping(fake_cache, monkeypatch):
+    monkeypatch.setattr(cache_module, "DEBUG", False)
+    node = _Node()
+    node.run({"query": "hello"})
+    hit = node.run({"query": "hello"})
+
+    assert "agents_used" not in hit
+    assert "debug_info" not in hit
+
+
+def test_distinct_keys_are_cached_separately(fake_cache):
+    node = _Node()
+    node.run({"query": "a"})
+    node.run({"query": "b"})
+
+    assert node.calls == 2
+    assert len(fake_cache) == 2
+
+
+def test_error_results_are_not_cached(fake_cache):
+    node = _Node()
+    node.run({"query": "fail"})
+    node.run({"query": "fail"})
+
+    assert node.calls == 2
+    assert fake_cache == {}
@@ -0,0 +1,42 @@
+import pytest
+
+from app.graph.workflow import _classify, _normalize_query
+
+
+@pytest.mark.parametrize("query, intent", [
+    ("Can you review my resume?", "resume_analysis"),
+    ("I analyzed my CV last week", "resume_analysis"),
+    ("Reviewing my cover letter", "resume_analysis"),
+    ("Let's do a mock interview", "interview_practice"),
+    ("Find me Python jobs in Berlin", "job_search"),
+    ("Searching for remote roles", "job_search"),
+    ("Any tips for salary negotiation?", "career_advice"),
+    ("What's the status of my application?", "application_tracking"),
+    ("hello there", "unknown"),
+])
+def test_classify_intent(query, intent):
+    assert _classify(_normalize_query(query))[0] == intent
+
+
+@pytest.mark.parametrize("query, intent", [
+    # Substrings of other words must not trigger a keyword
+    ("I resumed work last week", "unknown"),
+    ("Show me something new", "unknown"),
+    ("Show the status of my application", "application_tracking"),
+])
+def test_classify_ignores_partial_word_matches(query, intent):
+    assert _classify(_normalize_query(query))[0] == intent
+
+
+def test_classify_first_matching_intent_wins():
+    # "find" is a job_search keyword, but interview keywords are checked first
+    assert _classify(_normalize_query("Find interview questions")) == ("interview_practice", 0.9)
+
+
+def test_classify_unknown_confidence():
+    assert _classify(_normalize_query("hello there")) == ("unknown", 0.5)
+
+
+def test_normalize_query_collapses_case_and_whitespace():
+    assert _normalize_query("  Review   MY\tResume ") == "review my resume"
+    assert _normalize_query(None) == ""
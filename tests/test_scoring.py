@@ -0,0 +1,42 @@
+import pytest
+
+from app.tools.scoring import match_score
+
+
+def test_empty_target_scores_zero():
+    assert match_score("python fastapi", "") == 0.0
+    assert match_score("python fastapi", None) == 0.0
+
+
+def test_empty_candidate_scores_zero():
+    assert match_score("", "python fastapi") == 0.0
+    assert match_score(None, "python fastapi") == 0.0
+
+
+def test_no_overlap_scores_zero():
+    assert match_score("java spring", "python fastapi") == 0.0
+
+
+def test_full_overlap_scores_one():
+    assert match_score("Senior Python and FastAPI engineer", "python fastapi") == 1.0
+
+
+def test_partial_overlap_uses_distinct_target_keywords():
+    # "python" repeats in the target but counts once: 1 of 2 distinct keywords
+    assert match_score("python developer", "python python golang") == pytest.approx(0.5)
+
+
+def test_tech_spellings_are_single_tokens():
+    assert match_score("C++ and Node.js", "c++ node.js") == 1.0
+    assert match_score("C and Node", "c++ node.js") == 0.0
+
+
+def test_stopwords_do_not_count():
+    job_description = "We need a Python engineer with the skills and drive to ship"
+
+    assert match_score("the and a with we need", job_description) == 0.0
+    assert match_score("I have Python skills", job_description) > 0.0
+
+
+def test_stopword_only_target_scores_zero():
+    assert match_score("python", "the and of") == 0.0
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from datetime import datetime
+from unittest import mock
+
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+from app.main import get_user_profile
+from app.tools import cache as cache_module
+
+USER = {
+    "id": 7,
+    "email": "user@example.com",
+    "profile_data": {"skills": ["Python"]},
+    "preferences": {},
+    "created_at": datetime(2024, 2, 1, 9, 30),
+    "updated_at": datetime(2024, 2, 5, 10, 0, 0, 123456)
+}
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/user/7/profile", "headers": headers})
+
+
+def _get_profile(db, if_none_match=None):
+    response = Response()
+    result = asyncio.run(get_user_profile(7, _request(if_none_match), response, db))
+    return result, response
+
+
+@pytest.fixture
+def db():
+    db = mock.Mock()
+    db.get_user.return_value = USER
+    return db
+
+
+def test_miss_returns_profile_with_etag(db, fake_cache):
+    profile, response = _get_profile(db)
+
+    assert profile["email"] == "user@example.com"
+    assert response.headers["etag"] == 'W/"2024-02-05T10:00:00.123456"'
+    assert response.headers["cache-control"] == "private, max-age=10"
+
+
+def test_matching_if_none_match_returns_304(db, fake_cache):
+    _, response = _get_profile(db)
+    result, _ = _get_profile(db, if_none_match=response.headers["etag"])
+
+    assert result.status_code == 304
+    assert result.body == b""
+    assert result.headers["etag"] == response.headers["etag"]
+
+
+def test_stale_if_none_match_returns_profile(db, fake_cache):
+    result, response = _get_profile(db, if_none_match='W/"2024-01-01T00:00:00"')
+
+    assert isinstance(result, dict)
+    assert response.headers["etag"] == 'W/"2024-02-05T10:00:00.123456"'
+
+
+def test_cache_hit_and_miss_produce_the_same_etag(db, fake_cache):
+    miss, miss_response = _get_profile(db)
+    hit, hit_response = _get_profile(db)
+
+    # The miss serves a datetime, the hit the ISO string read back from Redis
+    assert isinstance(miss["updated_at"], datetime)
+    assert isinstance(hit["updated_at"], str)
+    assert db.get_user.call_count == 1
+    assert hit_response.headers["etag"] == miss_response.headers["etag"]
+
+
+def test_redis_down_falls_back_to_database(db, monkeypatch):
+    # Inside the retry window the cache reports a miss without touching Redis
+    monkeypatch.setattr(cache_module.cache, "_retry_after", time.time() + 60)
+    monkeypatch.setattr(cache_module.redis, "Redis", mock.Mock(side_effect=AssertionError("Redis contacted")))
+
+    first, _ = _get_profile(db)
+    second, response = _get_profile(db)
+
+    assert first["id"] == second["id"] == 7
+    assert db.get_user.call_count == 2
+    assert response.headers["etag"] == 'W/"2024-02-05T10:00:00.123456"'
@@ -0,0 +1,109 @@
+import pytest
+
+from app.graph import workflow as workflow_module
+from app.graph.workflow import JobCoachWorkflow
+
+RESUME_TEXT = "Software engineer with five years of Python, FastAPI and SQL experience."
+
+
+@pytest.fixture(scope="module")
+def workflow():
+    return JobCoachWorkflow()
+
+
+def test_results_do_not_share_mock_payloads(workflow, fake_cache):
+    first = workflow.process_query("Review my resume", resume_text=RESUME_TEXT)
+    first["resume_analysis"]["overall_score"] = 0
+    first["user_profile"]["name"] = "Changed"
+
+    second = workflow.process_query("Review my resume", resume_text=RESUME_TEXT)
+    assert second["resume_analysis"]["overall_score"] == 7.5
+    assert second["user_profile"]["name"] == "Test User"
+
+
+def test_untouched_list_fields_are_lists(workflow, fake_cache):
+    result = workflow.process_query("Find Python jobs", job_search_query="Python")
+
+    for key in ("interview_questions", "interview_answers", "knowledge_sources", "agent_messages"):
+        assert result[key] == []
+
+
+def test_profile_agents_run_after_memory_load(workflow, fake_cache):
+    nodes = [node for node, _ in workflow.stream_query("Review my resume", resume_text=RESUME_TEXT)]
+
+    assert nodes == ["router", "memory_load", "resume", "summary", "memory_save"]
+
+
+def test_other_agents_skip_memory_load(workflow, fake_cache):
+    result = workflow.process_query("Find Python jobs", job_search_query="Python")
+
+    assert result["agents_used"] == ["router", "job_search", "summary", "memory_save"]
+    assert result["user_profile"] is None
+
+
+def test_node_errors_redact_credentials(workflow, fake_cache, monkeypatch):
+    def leak(*args):
+        raise RuntimeError("upstream rejected api_key=sk-abcdefghijklmnopqrstuvwx")
+
+    monkeypatch.setattr(workflow_module, "match_score", leak)
+    result = workflow.process_query("Review my resume", resume_text=RESUME_TEXT, job_description="Python engineer")
+
+    assert "sk-abcdefghijklmnopqrstuvwx" not in result["error_message"]
+    assert "sk-abcdefghijklmnopqrstuvwx" not in result["response"]
+    assert "[REDACTED]" in result["error_message"]
+
+
+@pytest.mark.parametrize("query", ["", "   ", "\n\t"])
+def test_process_query_blank_query_skips_graph(workflow, query):
+    result = workflow.process_query(query, session_id="s1")
+
+    assert result["response"] == "Please enter a question or request."
+    assert result["session_id"] == "s1"
+    assert result["agents_used"] == []
+
+
+def test_stream_query_blank_query_yields_single_summary(workflow):
+    updates = list(workflow.stream_query("   ", session_id="s1"))
+
+    assert len(updates) == 1
+    node, update = updates[0]
+    assert node == "summary"
+    assert update["response"] == "Please enter a question or request."
+
+
+def test_stream_query_yields_each_node_update(workflow, fake_cache):
+    updates = dict(workflow.stream_query("Find Python jobs", job_search_query="Python"))
+
+    assert list(updates) == ["router", "job_search", "summary", "memory_save"]
+    assert updates["router"]["intent"] == "job_search"
+    assert updates["summary"]["response"].startswith("## Job Search Results")
+
+
+def test_process_queries_preserves_input_order_with_blanks(workflow, fake_cache):
+    results = workflow.process_queries([
+        {"user_query": "Find Python jobs", "job_search_query": "Python"},
+        {"user_query": "  ", "session_id": "blank"},
+        {"user_query": "Any tips for negotiating salary?"},
+        {"user_query": ""},
+        {"user_query": "Let's do a mock interview", "interview_role": "Data Engineer"},
+    ])
+
+    assert [result.get("intent") for result in results] == [
+        "job_search", None, "career_advice", None, "interview_practice"
+    ]
+    assert results[1]["session_id"] == "blank"
+    assert results[1]["response"] == results[3]["response"] == "Please enter a question or request."
+
+
+def test_process_queries_matches_process_query(workflow, fake_cache):
+    query = {"user_query": "Review my resume", "resume_text": RESUME_TEXT, "session_id": "s1"}
+
+    [batched] = workflow.process_queries([query])
+    single = workflow.process_query(**query)
+
+    assert batched["response"] == single["response"]
+    assert batched["agents_used"] == single["agents_used"]
+
+
+def test_process_queries_empty_input(workflow):
+    assert workflow.process_queries([]) == []